@@ -30,6 +30,30 @@ class Filter(ABC):
         return resps
 
 
+class ElementwiseFilter(Filter):
+    """
+    Base class for filters that transform every response independently.
+    Subclasses provide `_element_fn`, either as a class attribute or set on
+    the instance in `__init__`. Sharing one `apply` means no per-call nested
+    closure (a fresh function object per invocation), and the element
+    function is bound to a local for the hot loop.
+
+    Elementwise filters also expose `apply_flat`, operating on a flat list
+    of responses; `FilterEnsemble` uses it to chain consecutive elementwise
+    steps without rebuilding the list-of-lists nesting between them.
+    """
+
+    _element_fn = None
+
+    def apply(self, resps, docs):
+        fn = self._element_fn
+        return [[fn(resp) for resp in inst] for inst in resps]
+
+    def apply_flat(self, flat_resps, docs):
+        fn = self._element_fn
+        return [fn(resp) for resp in flat_resps]
+
+
 @dataclass
 class FilterEnsemble:
     """
@@ -46,9 +70,30 @@ class FilterEnsemble:
         resps, docs = zip(*((inst.resps, inst.doc) for inst in instances))
         resps, docs = list(resps), list(docs)
 
-        for f in self.filters:
-            # apply filters in sequence
-            resps = f().apply(resps, docs)
+        filters = [f() for f in self.filters]
+        idx = 0
+        while idx < len(filters):
+            # fuse consecutive elementwise filters: flatten the nested
+            # responses once, run their per-element functions over the flat
+            # list, and rebuild the nesting once at the end of the run. This
+            # avoids reallocating len(resps) inner lists at every step.
+            if isinstance(filters[idx], ElementwiseFilter):
+                end = idx + 1
+                while end < len(filters) and isinstance(
+                    filters[end], ElementwiseFilter
+                ):
+                    end += 1
+                lengths = [len(inst) for inst in resps]
+                flat = [resp for inst in resps for resp in inst]
+                for f in filters[idx:end]:
+                    flat = f.apply_flat(flat, docs)
+                flat_iter = iter(flat)
+                resps = [[next(flat_iter) for _ in range(n)] for n in lengths]
+                idx = end
+            else:
+                # apply filters in sequence
+                resps = filters[idx].apply(resps, docs)
+                idx += 1
 
         # add the end results after filtering to filtered_requests of their respective source instances.
         # has key `self.name`: each FilterEnsemble applied in a given run should use a different name.
@@ -175,7 +175,12 @@ def is_higher_better(metric_name) -> bool:
 
 def register_filter(name):
     def decorate(cls):
-        if name in FILTER_REGISTRY:
+        registered = FILTER_REGISTRY.get(name)
+        if registered is not None:
+            if registered is cls:
+                # decorators re-run when a module is imported again under
+                # another path; re-registering the same class is a no-op.
+                return cls
             eval_logger.info(
                 f"Registering filter `{name}` that is already in Registry {FILTER_REGISTRY}"
             )
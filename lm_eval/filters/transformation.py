@@ -1,33 +1,40 @@
-from lm_eval.api.filter import Filter
+import json
+import sys
+
+from lm_eval.api.filter import ElementwiseFilter
 from lm_eval.api.registry import register_filter
 
 
-@register_filter("lowercase")
-class LowercaseFilter(Filter):
-    def __init__(self) -> None:
-        pass
+try:
+    # optional C-accelerated decoder; fenced LLM payloads (e.g. long BIO tag
+    # lists) are frequently large enough for the difference to matter.
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
-    def apply(self, resps, docs):
-        def filter_set(inst):
-            return [resp.lower() for resp in inst]
 
-        return [filter_set(resp) for resp in resps]
+def _to_lower(resp):
+    # str.islower() is a single C-level scan; skipping str.lower() for
+    # already-lowercase responses avoids allocating an identical copy.
+    return resp if resp.islower() else resp.lower()
 
 
-@register_filter("uppercase")
-class UppercaseFilter(Filter):
-    def __init__(self) -> None:
-        pass
+def _to_upper(resp):
+    return resp if resp.isupper() else resp.upper()
 
-    def apply(self, resps, docs):
-        def filter_set(inst):
-            return [resp.upper() for resp in inst]
 
-        return [filter_set(resp) for resp in resps]
+@register_filter("lowercase")
+class LowercaseFilter(ElementwiseFilter):
+    _element_fn = staticmethod(_to_lower)
+
+
+@register_filter("uppercase")
+class UppercaseFilter(ElementwiseFilter):
+    _element_fn = staticmethod(_to_upper)
 
 
 @register_filter("map")
-class MapFilter(Filter):
+class MapFilter(ElementwiseFilter):
     def __init__(self, mapping_dict: dict = None, default_value=None) -> None:
         """
         Initializes the MapFilter with a given mapping dictionary and default value.
@@ -46,11 +53,116 @@ class MapFilter(Filter):
         assert isinstance(
             mapping_dict, dict
         ), "Provided mapping_dict is not a dictionary"
-        self.mapping_dict = mapping_dict
+        # intern the string keys so that probing the dict with an equally
+        # interned response short-circuits on pointer identity instead of
+        # comparing characters.
+        self.mapping_dict = {
+            sys.intern(k) if isinstance(k, str) else k: v
+            for k, v in mapping_dict.items()
+        }
         self.default_value = default_value
+        # when every key is a single ASCII character (the multiple-choice
+        # case: answer letters mapped to choice indices), a flat 128-slot
+        # table indexed by ord() replaces the hash probe entirely.
+        if mapping_dict and all(
+            isinstance(k, str) and len(k) == 1 and ord(k) < 128
+            for k in mapping_dict
+        ):
+            lut = [default_value] * 128
+            for k, v in mapping_dict.items():
+                lut[ord(k)] = v
+            self._char_lut = lut
+        else:
+            self._char_lut = None
 
+    # dict.get with a default takes two arguments, so funnelling it through
+    # a one-argument _element_fn would cost an adapter closure per element;
+    # inlining the lookup keeps it a single C call.
     def apply(self, resps, docs):
-        def filter_set(inst):
-            return [self.mapping_dict.get(resp, self.default_value) for resp in inst]
+        return [self.apply_flat(inst, docs) for inst in resps]
+
+    def apply_flat(self, flat_resps, docs):
+        default = self.default_value
+        lut = self._char_lut
+        if lut is not None:
+            return [
+                lut[ord(resp)]
+                if type(resp) is str and len(resp) == 1 and ord(resp) < 128
+                else default
+                for resp in flat_resps
+            ]
+        get = self.mapping_dict.get
+        intern = sys.intern
+        # LLM outputs repeat the same short answers thousands of times;
+        # interning each response makes the repeats a single dict probe that
+        # hits the identity fast path against the interned keys.
+        return [
+            get(intern(resp) if type(resp) is str else resp, default)
+            for resp in flat_resps
+        ]
+
+
+@register_filter("cast_to_dtype")
+class CastToDtypeFilter(ElementwiseFilter):
+    """
+    Casts each response to `dtype`, given either as a builtin type name
+    such as "int" or directly as a callable.
+    """
+
+    _DTYPES = {"str": str, "int": int, "float": float, "bool": bool}
+
+    def __init__(self, dtype="str") -> None:
+        self.dtype = self._DTYPES[dtype] if isinstance(dtype, str) else dtype
+
+    # the skip-if-already-typed check needs the dtype in hand, so the cast
+    # stays inlined here rather than behind _element_fn.
+    def apply(self, resps, docs):
+        return [self.apply_flat(inst, docs) for inst in resps]
+
+    def apply_flat(self, flat_resps, docs):
+        dtype = self.dtype
+        # responses already of the target type pass through untouched: the
+        # exact type check is a C-level pointer comparison, whereas calling
+        # the constructor would allocate a fresh object every time.
+        return [
+            resp if type(resp) is dtype else dtype(resp) for resp in flat_resps
+        ]
+
+
+@register_filter("parse_json_markdown")
+class ParseJsonMarkdownFilter(ElementwiseFilter):
+    """
+    Parses a JSON value out of a model response, accepting both bare JSON
+    and JSON wrapped in a markdown ```json ... ``` code fence.
+    `fallback` defines the output returned when no valid JSON can be extracted.
+    """
+
+    def __init__(self, fallback="[invalid]") -> None:
+        self.fallback = fallback
+        self._element_fn = self._parse_resp
+
+    @staticmethod
+    def _parse_json_markdown(json_string: str):
+        try:
+            return _json_loads(json_string)
+        # both json.JSONDecodeError and orjson.JSONDecodeError subclass
+        # ValueError, so this stays decoder-agnostic.
+        except ValueError:
+            # locate the code fence by literal search instead of a regex:
+            # `str.find` is a linear scan with no backtracking on long responses.
+            start = json_string.find("```")
+            if start == -1:
+                raise
+            start += 3
+            if json_string.startswith("json", start):
+                start += 4
+            end = json_string.find("```", start)
+            if end == -1:
+                raise
+            return _json_loads(json_string[start:end].strip())
 
-        return [filter_set(resp) for resp in resps]
+    def _parse_resp(self, resp):
+        try:
+            return self._parse_json_markdown(resp)
+        except Exception:
+            return self.fallback
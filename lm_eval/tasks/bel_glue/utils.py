@@ -0,0 +1,289 @@
+# Utilities and metrics for the BelGLUE named-entity-recognition tasks.
+#
+# The chunk F1 / accuracy computation follows the reference conlleval script:
+# https://www.clips.uantwerpen.be/conll2000/chunking/conlleval.txt
+
+from collections import defaultdict
+
+import numpy as np
+
+
+UNER_PROMPT = (
+    "Label each token of the sentence with one of the named entity tags: "
+    "B-PER, I-PER, B-ORG, I-ORG, B-LOC, I-LOC or O.\n"
+    "Answer with a JSON list containing exactly one tag per token.\n"
+    "Tokens: {tokens}\n"
+    "Tags:"
+)
+
+
+# str.format on a list argument goes through the keyword-argument machinery
+# and reprs the whole list in one opaque call; with the prompt pre-split
+# around {tokens}, only the token-list segment is built per doc and the
+# constant prefix/suffix strings are reused as-is.
+_PROMPT_PRE, _PROMPT_POST = UNER_PROMPT.split("{tokens}")
+
+
+def doc_to_text(doc):
+    tokens = doc["tokens"].split()
+    return _PROMPT_PRE + "[" + ", ".join(map(repr, tokens)) + "]" + _PROMPT_POST
+
+
+def doc_to_target(doc):
+    labels = doc["labels"].split()
+    return [labels]
+
+
+_TAG_CACHE = {}
+
+
+def _split_tag(chunk_tag, _cache=_TAG_CACHE):
+    """
+    Split a BIO chunk tag into its (prefix, chunk_type) pair, e.g.
+    "B-PER" -> ("B", "PER") and "O" -> ("O", None).
+
+    The tag vocabulary is tiny (a handful of entity types), so results are
+    cached in a module-level dict: after the first few tokens each call is a
+    single dict probe instead of a str.split allocating a fresh list.
+    """
+    result = _cache.get(chunk_tag)
+    if result is None:
+        if chunk_tag == "O":
+            result = ("O", None)
+        else:
+            prefix, _, chunk_type = chunk_tag.partition("-")
+            result = (prefix, chunk_type)
+        _cache[chunk_tag] = result
+    return result
+
+
+def _is_chunk_end(prev_tag, tag):
+    prefix1, chunk_type1 = _split_tag(prev_tag)
+    prefix2, chunk_type2 = _split_tag(tag)
+    if prefix1 == "O":
+        return False
+    if prefix2 == "O":
+        return True
+    if chunk_type1 != chunk_type2:
+        return True
+    return prefix2 in ("B", "S") or prefix1 in ("E", "S")
+
+
+def _is_chunk_start(prev_tag, tag):
+    prefix1, chunk_type1 = _split_tag(prev_tag)
+    prefix2, chunk_type2 = _split_tag(tag)
+    if prefix2 == "O":
+        return False
+    if prefix1 == "O":
+        return True
+    if chunk_type1 != chunk_type2:
+        return True
+    return prefix2 in ("B", "S") or prefix1 in ("E", "S")
+
+
+_TRANSITION_CACHE = {}
+
+
+def _transition(prev_tag, tag, _cache=_TRANSITION_CACHE):
+    """
+    Classify the (prev_tag, tag) transition once and cache it.
+
+    Returns (is_start, is_end, tag_type): whether a chunk starts at / ends
+    before `tag`, plus the chunk type of `tag`. There are only ~|tags|**2
+    distinct transitions, so the cache saturates after a few sequences and
+    the four predicate calls per token pair collapse into one dict probe
+    each for gold and pred.
+    """
+    result = _cache.get((prev_tag, tag))
+    if result is None:
+        result = (
+            _is_chunk_start(prev_tag, tag),
+            _is_chunk_end(prev_tag, tag),
+            _split_tag(tag)[1],
+        )
+        _cache[(prev_tag, tag)] = result
+    return result
+
+
+def _count_chunks(true_seqs, pred_seqs):
+    """
+    Single pass over aligned gold/predicted tag sequences, collecting
+    per-type chunk counts (for span F1) and per-tag token counts (for
+    accuracy), as in conlleval.
+    """
+    correct_chunks = defaultdict(int)
+    true_chunks = defaultdict(int)
+    pred_chunks = defaultdict(int)
+    correct_counts = defaultdict(int)
+    true_counts = defaultdict(int)
+    pred_counts = defaultdict(int)
+
+    length = len(true_seqs)
+    if not length:
+        return (
+            correct_chunks,
+            true_chunks,
+            pred_chunks,
+            correct_counts,
+            true_counts,
+            pred_counts,
+        )
+
+    # intern the tag vocabulary to small integer ids and expand the
+    # transition cache into a dense n*n table, so the loop below runs on
+    # machine integers and flat list indexing -- the data layout a compiled
+    # kernel would use -- instead of hashing a string pair per token.
+    tags = sorted(set(true_seqs) | set(pred_seqs) | {"O"})
+    tag2id = {t: i for i, t in enumerate(tags)}
+    n = len(tags)
+    trans = [_transition(prev, curr) for prev in tags for curr in tags]
+    ta = np.fromiter((tag2id[t] for t in true_seqs), dtype=np.intp, count=length)
+    pa = np.fromiter((tag2id[t] for t in pred_seqs), dtype=np.intp, count=length)
+
+    # the per-tag token counts are dense histograms over the id space:
+    # three np.bincount passes (vectorized C loops) replace per-token dict
+    # updates, leaving the loop below tracking only chunk state.
+    true_hist = np.bincount(ta, minlength=n)
+    pred_hist = np.bincount(pa, minlength=n)
+    correct_hist = np.bincount(ta[ta == pa], minlength=n)
+    for tag_id, tag in enumerate(tags):
+        if true_hist[tag_id]:
+            true_counts[tag] = int(true_hist[tag_id])
+        if pred_hist[tag_id]:
+            pred_counts[tag] = int(pred_hist[tag_id])
+        if correct_hist[tag_id]:
+            correct_counts[tag] = int(correct_hist[tag_id])
+
+    # fuse the (prev, curr) ids into one transition code per token, gather
+    # the chunk-start / chunk-end bits for both sequences from boolean LUTs,
+    # and walk only the positions where a boundary occurs in either
+    # sequence. NER streams are mostly "O", so boundary events are sparse
+    # and the Python-level state machine skips the vast majority of tokens.
+    # Between two events neither sequence opens or closes a chunk, so the
+    # matching state cannot change there.
+    o_id = tag2id["O"]
+    codes_t = np.concatenate(([o_id], ta[:-1])) * n + ta
+    codes_p = np.concatenate(([o_id], pa[:-1])) * n + pa
+    start_lut = np.fromiter((s for s, _, _ in trans), dtype=bool, count=n * n)
+    end_lut = np.fromiter((e for _, e, _ in trans), dtype=bool, count=n * n)
+    events = np.nonzero(
+        start_lut[codes_t]
+        | end_lut[codes_t]
+        | start_lut[codes_p]
+        | end_lut[codes_p]
+    )[0]
+
+    correct_chunk = None
+
+    for code_t, code_p in zip(codes_t[events].tolist(), codes_p[events].tolist()):
+        true_start, true_end, true_type = trans[code_t]
+        pred_start, pred_end, pred_type = trans[code_p]
+
+        if correct_chunk is not None:
+            if pred_end and true_end:
+                correct_chunks[correct_chunk] += 1
+                correct_chunk = None
+            elif pred_end != true_end or true_type != pred_type:
+                correct_chunk = None
+
+        if true_start and pred_start and true_type == pred_type:
+            correct_chunk = true_type
+        if true_start:
+            true_chunks[true_type] += 1
+        if pred_start:
+            pred_chunks[pred_type] += 1
+
+    if correct_chunk is not None:
+        correct_chunks[correct_chunk] += 1
+
+    return (
+        correct_chunks,
+        true_chunks,
+        pred_chunks,
+        correct_counts,
+        true_counts,
+        pred_counts,
+    )
+
+
+def _flatten(items):
+    """
+    Concatenate per-document (golds, preds) tag sequences, separating
+    documents with an "O" token so that chunks cannot run across document
+    boundaries. Predictions are padded / truncated to the gold length with
+    "O", since model output need not line up with the token count.
+    """
+    true_seqs, pred_seqs = [], []
+    for golds, preds in items:
+        if true_seqs:
+            true_seqs.append("O")
+            pred_seqs.append("O")
+        if len(preds) < len(golds):
+            preds = list(preds) + ["O"] * (len(golds) - len(preds))
+        true_seqs.extend(golds)
+        pred_seqs.extend(preds[: len(golds)])
+    return true_seqs, pred_seqs
+
+
+# the three aggregations below are typically all requested for the same task,
+# and each needs the same O(N) _count_chunks pass. A single-entry memo lets
+# the second and third aggregation reuse the first one's result. The key is
+# elementwise identity against a stored copy of the items list: O(n_docs) to
+# check, negligible next to the O(n_tokens) counting pass, and it cannot
+# confuse two lists that share a prefix but differ in the tail. Holding the
+# copy also pins the item ids, so `is` cannot alias recycled objects.
+_LAST_COMPUTE = {"items": None, "result": None}
+
+
+def _compute_all(items):
+    """Return (acc, acc_non0, f1) for a list of (golds, preds) items."""
+    memo = _LAST_COMPUTE
+    cached = memo["items"]
+    if (
+        cached is not None
+        and len(cached) == len(items)
+        and all(x is y for x, y in zip(cached, items))
+    ):
+        return memo["result"]
+
+    (
+        correct_chunks,
+        true_chunks,
+        pred_chunks,
+        correct_counts,
+        true_counts,
+        _,
+    ) = _count_chunks(*_flatten(items))
+
+    # separator tokens inserted by _flatten are "O" on both sides; discount
+    # them so that accuracy only reflects real tokens.
+    boundary = max(len(items) - 1, 0)
+    total = sum(true_counts.values()) - boundary
+    acc = (sum(correct_counts.values()) - boundary) / total if total else 0.0
+
+    correct_non0 = sum(v for k, v in correct_counts.items() if k != "O")
+    total_non0 = sum(v for k, v in true_counts.items() if k != "O")
+    acc_non0 = correct_non0 / total_non0 if total_non0 else 0.0
+
+    correct = sum(correct_chunks.values())
+    pred = sum(pred_chunks.values())
+    true = sum(true_chunks.values())
+    prec = correct / pred if pred else 0.0
+    rec = correct / true if true else 0.0
+    f1 = 2 * prec * rec / (prec + rec) if prec + rec else 0.0
+
+    result = (acc, acc_non0, f1)
+    memo["items"], memo["result"] = list(items), result
+    return result
+
+
+def conlleval_f1(items):
+    return _compute_all(items)[2]
+
+
+def conlleval_acc(items):
+    return _compute_all(items)[0]
+
+
+def conlleval_acc_non0(items):
+    return _compute_all(items)[1]
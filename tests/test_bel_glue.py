@@ -0,0 +1,174 @@
+import random
+from collections import defaultdict
+
+import pytest
+
+from lm_eval.tasks.bel_glue import utils
+
+
+# ---------------------------------------------------------------------------
+# reference implementation: the straightforward per-token conlleval loop,
+# kept deliberately naive as ground truth for the optimized _count_chunks.
+# ---------------------------------------------------------------------------
+
+
+def _ref_split_tag(chunk_tag):
+    if chunk_tag == "O":
+        return ("O", None)
+    prefix, _, chunk_type = chunk_tag.partition("-")
+    return (prefix, chunk_type)
+
+
+def _ref_is_chunk_end(prev_tag, tag):
+    prefix1, chunk_type1 = _ref_split_tag(prev_tag)
+    prefix2, chunk_type2 = _ref_split_tag(tag)
+    if prefix1 == "O":
+        return False
+    if prefix2 == "O":
+        return True
+    if chunk_type1 != chunk_type2:
+        return True
+    return prefix2 in ("B", "S") or prefix1 in ("E", "S")
+
+
+def _ref_is_chunk_start(prev_tag, tag):
+    prefix1, chunk_type1 = _ref_split_tag(prev_tag)
+    prefix2, chunk_type2 = _ref_split_tag(tag)
+    if prefix2 == "O":
+        return False
+    if prefix1 == "O":
+        return True
+    if chunk_type1 != chunk_type2:
+        return True
+    return prefix2 in ("B", "S") or prefix1 in ("E", "S")
+
+
+def _ref_count_chunks(true_seqs, pred_seqs):
+    correct_chunks = defaultdict(int)
+    true_chunks = defaultdict(int)
+    pred_chunks = defaultdict(int)
+    correct_counts = defaultdict(int)
+    true_counts = defaultdict(int)
+    pred_counts = defaultdict(int)
+
+    prev_true_tag, prev_pred_tag = "O", "O"
+    correct_chunk = None
+
+    for true_tag, pred_tag in zip(true_seqs, pred_seqs):
+        if true_tag == pred_tag:
+            correct_counts[true_tag] += 1
+        true_counts[true_tag] += 1
+        pred_counts[pred_tag] += 1
+
+        _, true_type = _ref_split_tag(true_tag)
+        _, pred_type = _ref_split_tag(pred_tag)
+
+        if correct_chunk is not None:
+            true_end = _ref_is_chunk_end(prev_true_tag, true_tag)
+            pred_end = _ref_is_chunk_end(prev_pred_tag, pred_tag)
+            if pred_end and true_end:
+                correct_chunks[correct_chunk] += 1
+                correct_chunk = None
+            elif pred_end != true_end or true_type != pred_type:
+                correct_chunk = None
+
+        true_start = _ref_is_chunk_start(prev_true_tag, true_tag)
+        pred_start = _ref_is_chunk_start(prev_pred_tag, pred_tag)
+        if true_start and pred_start and true_type == pred_type:
+            correct_chunk = true_type
+        if true_start:
+            true_chunks[true_type] += 1
+        if pred_start:
+            pred_chunks[pred_type] += 1
+
+        prev_true_tag, prev_pred_tag = true_tag, pred_tag
+
+    if correct_chunk is not None:
+        correct_chunks[correct_chunk] += 1
+
+    return (
+        correct_chunks,
+        true_chunks,
+        pred_chunks,
+        correct_counts,
+        true_counts,
+        pred_counts,
+    )
+
+
+# weighted towards "O" like real NER corpora, plus a rogue "S-"/"E-" pair to
+# exercise the non-BIO branches of the transition logic.
+TAGS = ["O", "O", "O", "B-PER", "I-PER", "B-ORG", "I-ORG", "B-LOC", "I-LOC", "S-PER", "E-ORG"]
+
+
+def test_count_chunks_fixed_case():
+    true = ["B-PER", "I-PER", "O", "B-LOC"]
+    pred = ["B-PER", "I-PER", "O", "B-ORG"]
+    (
+        correct_chunks,
+        true_chunks,
+        pred_chunks,
+        correct_counts,
+        true_counts,
+        pred_counts,
+    ) = utils._count_chunks(true, pred)
+    assert dict(correct_chunks) == {"PER": 1}
+    assert dict(true_chunks) == {"PER": 1, "LOC": 1}
+    assert dict(pred_chunks) == {"PER": 1, "ORG": 1}
+    assert dict(correct_counts) == {"B-PER": 1, "I-PER": 1, "O": 1}
+    assert dict(true_counts) == {"B-PER": 1, "I-PER": 1, "O": 1, "B-LOC": 1}
+    assert dict(pred_counts) == {"B-PER": 1, "I-PER": 1, "O": 1, "B-ORG": 1}
+
+
+def test_count_chunks_empty():
+    assert [dict(d) for d in utils._count_chunks([], [])] == [{}] * 6
+
+
+def test_count_chunks_matches_reference():
+    rng = random.Random(1234)
+    for _ in range(300):
+        n = rng.randint(1, 40)
+        true = [rng.choice(TAGS) for _ in range(n)]
+        pred = [rng.choice(TAGS) for _ in range(n)]
+        got = [dict(d) for d in utils._count_chunks(true, pred)]
+        want = [dict(d) for d in _ref_count_chunks(true, pred)]
+        assert got == want, (true, pred)
+
+
+def test_metrics_fixed_values():
+    items = [
+        (["B-PER", "I-PER", "O"], ["B-PER", "I-PER", "O"]),
+        (["O", "B-LOC"], ["O", "B-ORG"]),
+    ]
+    assert utils.conlleval_f1(items) == pytest.approx(0.5)
+    assert utils.conlleval_acc(items) == pytest.approx(0.8)
+    assert utils.conlleval_acc_non0(items) == pytest.approx(2 / 3)
+
+
+def test_metrics_pad_and_truncate_predictions():
+    # predictions shorter than gold are padded with "O", longer are truncated
+    items = [
+        (["B-PER", "I-PER", "O"], ["B-PER"]),
+        (["O"], ["O", "B-LOC"]),
+    ]
+    assert utils.conlleval_acc(items) == pytest.approx(0.75)
+    assert utils.conlleval_acc_non0(items) == pytest.approx(0.5)
+    assert utils.conlleval_f1(items) == 0.0
+
+
+def test_compute_all_memo_not_aliased():
+    a = (["B-PER"], ["B-PER"])
+    b = (["B-LOC"], ["B-LOC"])
+    c = (["B-LOC"], ["O"])
+    assert utils.conlleval_acc([a, b]) == pytest.approx(1.0)
+    # shares its first item with the previous call but differs in the tail;
+    # the memo must miss and recompute
+    assert utils.conlleval_acc([a, c]) == pytest.approx(0.5)
+
+
+def test_doc_helpers():
+    doc = {"tokens": "Янка Купала", "labels": "B-PER I-PER"}
+    assert utils.doc_to_text(doc) == utils.UNER_PROMPT.format(
+        tokens=["Янка", "Купала"]
+    )
+    assert utils.doc_to_target(doc) == [["B-PER", "I-PER"]]
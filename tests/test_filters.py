@@ -0,0 +1,84 @@
+from lm_eval.api.filter import Filter, FilterEnsemble
+from lm_eval.api.instance import Instance
+from lm_eval.filters.transformation import (
+    CastToDtypeFilter,
+    LowercaseFilter,
+    MapFilter,
+    UppercaseFilter,
+)
+
+
+class _TakeFirstTwo(Filter):
+    """A non-elementwise step: truncates each response list."""
+
+    def apply(self, resps, docs):
+        return [inst[:2] for inst in resps]
+
+
+# includes an empty response list and ragged lengths
+RESPS = [
+    ["A", "b", "C"],
+    [],
+    ["yes"],
+    ["NO", "A"],
+]
+
+
+def _make_instances():
+    return [
+        Instance(
+            request_type="generate_until",
+            doc={},
+            arguments=("", {}),
+            idx=i,
+            resps=list(resps),
+        )
+        for i, resps in enumerate(RESPS)
+    ]
+
+
+def _pipeline():
+    # elementwise -> elementwise -> non-elementwise -> elementwise ->
+    # elementwise, so FilterEnsemble fuses two separate runs around the
+    # truncation step
+    return [
+        lambda: LowercaseFilter(),
+        lambda: MapFilter({"a": 1, "yes": 2, "no": 3}, default_value=0),
+        lambda: _TakeFirstTwo(),
+        lambda: CastToDtypeFilter("str"),
+        lambda: UppercaseFilter(),
+    ]
+
+
+def test_ensemble_matches_sequential_apply():
+    instances = _make_instances()
+    FilterEnsemble(name="fused", filters=_pipeline()).apply(instances)
+
+    resps = [list(r) for r in RESPS]
+    docs = [inst.doc for inst in instances]
+    for f in _pipeline():
+        resps = f().apply(resps, docs)
+
+    assert [inst.filtered_resps["fused"] for inst in instances] == resps
+
+
+def test_elementwise_only_pipeline_preserves_shape():
+    instances = _make_instances()
+    FilterEnsemble(name="lower", filters=[lambda: LowercaseFilter()]).apply(instances)
+    assert [inst.filtered_resps["lower"] for inst in instances] == [
+        ["a", "b", "c"],
+        [],
+        ["yes"],
+        ["no", "a"],
+    ]
+
+
+def test_non_elementwise_only_pipeline():
+    instances = _make_instances()
+    FilterEnsemble(name="head", filters=[lambda: _TakeFirstTwo()]).apply(instances)
+    assert [inst.filtered_resps["head"] for inst in instances] == [
+        ["A", "b"],
+        [],
+        ["yes"],
+        ["NO", "A"],
+    ]